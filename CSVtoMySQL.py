@@ -1,38 +1,310 @@
 import mysql.connector
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from collections import deque
+import copy
+import fnmatch
 import hashlib
+import io
 import os
 import json
 from datetime import datetime
 import logging
+import logging.handlers
+import mmap
+import multiprocessing
+import queue
+import re
+import tempfile
+import threading
+import time
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    from watchdog.events import PatternMatchingEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+# Codes d'erreur MySQL signalant que LOAD DATA LOCAL INFILE est refusé
+# (1148: commande non autorisée, 2068: refus côté client, 3948: désactivé côté serveur)
+LOCAL_INFILE_ERRNOS = {1148, 2068, 3948}
+
+# Code d'erreur MySQL d'une transaction annulée par InnoDB sur un interblocage, et nombre d'essais d'un bloc
+LOCK_DEADLOCK_ERRNO = 1213
+DEADLOCK_RETRIES = 3
+
+# Code de l'avertissement d'une ligne écartée par IGNORE car son row_hash est déjà présent
+DUPLICATE_KEY_ERRNO = 1062
+
+# Type de la colonne row_hash selon l'algorithme de hash configuré
+ROW_HASH_TYPES = {
+    'md5': 'VARCHAR(64)',
+    'xxh3_64': 'BIGINT UNSIGNED',
+    'xxh3_128': 'VARCHAR(32)',
+    'pandas64': 'BIGINT UNSIGNED'
+}
+
+# Hôtes considérés comme locaux (pas de compression du protocole par défaut)
+LOCAL_HOSTS = {'localhost', '127.0.0.1', '::1'}
+
+# Nombre de connexions insérant en parallèle quand l'hôte n'est pas local
+POOL_SIZE = 4
+
+# Nombre de lignes envoyées par requête INSERT multi-lignes (par défaut de database.batch_size)
+BATCH_SIZE = 10000
+
+# Nombre de lignes dont la taille moyenne estime celle d'une requête INSERT multi-lignes
+PACKET_SAMPLE_ROWS = 100
+
+# Nombre maximal de paramètres d'une requête préparée côté serveur
+MAX_PREPARED_PARAMS = 65535
+
+# Au-delà de cette taille (en Mo), le CSV est lu par blocs de CHUNK_SIZE lignes
+# (valeurs par défaut de csv.large_file_mb et csv.chunk_size)
+LARGE_FILE_MB = 100
+CHUNK_SIZE = 100000
+
+# Dtypes numériques que le moteur C de pandas déduit des colonnes d'un CSV (le texte est noté 'str')
+CSV_NUMERIC_DTYPES = ('int64', 'uint64', 'float64')
+
+# Tampon d'insertion massive de la session pendant un import (256 Mo)
+BULK_INSERT_BUFFER_SIZE = 256 * 1024 * 1024
+
+# Nombre d'octets précédant la position de reprise dont l'empreinte vérifie qu'un fichier n'a pas été réécrit
+SIGNATURE_BYTES = 1024
+
+# Délai sans nouvel événement (en secondes) marquant la fin d'une rafale d'écritures surveillée
+EVENT_DEBOUNCE = 0.5
+
+# Nombre maximal de blocs lus et hashés d'avance en attente d'insertion
+PIPELINE_DEPTH = 4
+
+# Taille des tranches d'octets analysées par chaque processus quand csv.parse_workers > 1 (64 Mo)
+RANGE_BYTES = 64 * 1024 * 1024
+
+# Nombre d'entrées de log gardées en mémoire avant écriture dans le fichier (WARNING et plus: écriture immédiate)
+LOG_BUFFER_RECORDS = 1000
+
+# Noms de table acceptés (lettres, chiffres et _, sans commencer par un chiffre)
+TABLE_NAME_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+def quote_identifier(name):
+    """
+    Entoure un identifiant MySQL de backticks, en doublant ceux qu'il contient
+    """
+    return '`' + str(name).replace('`', '``') + '`'
+
+def quote_table_name(name):
+    """
+    Vérifie un nom de table (configuration ou ligne de commande) et le retourne entre backticks
+    """
+    if not isinstance(name, str) or not TABLE_NAME_PATTERN.fullmatch(name):
+        raise ValueError(f"Nom de table invalide: {name!r}")
+    return quote_identifier(name)
+
+def csv_read_dtypes(dtypes):
+    """
+    Convertit des dtypes notés par csv_dtype_summary en argument dtype de pandas.read_csv
+    (None: types déduits du texte lu)
+    """
+    if dtypes is None:
+        return None
+    # str (le type Python) donne des chaînes avec NaN pour les valeurs manquantes, comme l'inférence
+    return {col: str if name == 'str' else name for col, name in dtypes.items()}
+
+def csv_dtype_summary(df):
+    """
+    Résume les types d'un bloc lu par le moteur C sans types imposés: dtype de chaque colonne
+    ('int64', 'uint64', 'float64', 'bool', ou 'str' pour le texte et les valeurs mêlées) et
+    colonnes entières ayant une valeur négative
+    """
+    dtypes = {}
+    signed = set()
+    if len(df) == 0:
+        # Sans ligne, les colonnes sont en object: rien n'est encore déduit
+        return dtypes, signed
+    for col, series in df.items():
+        kind = series.dtype.kind
+        dtypes[col] = series.dtype.name if kind in 'iufb' else 'str'
+        if kind == 'i' and len(series) and series.min() < 0:
+            signed.add(col)
+    return dtypes, signed
+
+def merge_csv_dtypes(first, second):
+    """
+    Résumé (csv_dtype_summary) des types qu'aurait déduits le moteur C en lisant d'un coup deux parties d'un fichier
+    """
+    dtypes = dict(first[0])
+    signed = first[1] | second[1]
+    for col, name in second[0].items():
+        current = dtypes.get(col, name)
+        if current == name:
+            dtypes[col] = name
+        elif {current, name} == {'int64', 'uint64'}:
+            # Entiers au-delà de BIGINT: non signés, sauf si la colonne a aussi des valeurs négatives
+            dtypes[col] = 'str' if col in signed else 'uint64'
+        elif current in CSV_NUMERIC_DTYPES and name in CSV_NUMERIC_DTYPES:
+            # Entiers et décimaux, ou entiers et valeurs manquantes: float64
+            dtypes[col] = 'float64'
+        else:
+            dtypes[col] = 'str'
+    return dtypes, signed
+
+def read_byte_range(csv_file, start, end):
+    """
+    Retourne les octets [start, end) d'un fichier
+    """
+    with open(csv_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return mapped[start:end]
+
+def parse_csv_bytes(data, columns, encoding, separator, dtypes=None):
+    """
+    Analyse des lignes CSV brutes (sans en-tête) avec les colonnes données, et les types imposés s'il y en a
+    """
+    return pd.read_csv(
+        io.BytesIO(data),
+        header=None,
+        names=columns,
+        dtype=csv_read_dtypes(dtypes),
+        encoding=encoding,
+        sep=separator,
+        low_memory=False
+    )
+
+def row_hash_function(algorithm):
+    """
+    Retourne la fonction de hash (bytes -> valeur de row_hash) d'un algorithme
+    """
+    if algorithm == 'md5':
+        # Hash de dédoublonnage, pas de sécurité: usedforsecurity=False l'autorise aussi en mode FIPS
+        return lambda data: hashlib.md5(data, usedforsecurity=False).hexdigest()
+    if algorithm == 'xxh3_64':
+        if xxhash is None:
+            raise ImportError("Le module xxhash est requis pour hash_algorithm 'xxh3_64' (pip install xxhash)")
+        # Entier 64 bits non signé, stocké tel quel en BIGINT UNSIGNED
+        return xxhash.xxh3_64_intdigest
+    if algorithm == 'xxh3_128':
+        if xxhash is None:
+            raise ImportError("Le module xxhash est requis pour hash_algorithm 'xxh3_128' (pip install xxhash)")
+        # 128 bits en 32 caractères hexadécimaux, comme md5
+        return xxhash.xxh3_128_hexdigest
+    if algorithm == 'pandas64':
+        # Pas de hash par ligne: hash_dataframe_rows hashe le DataFrame entier colonne par colonne
+        return None
+    raise ValueError(f"Algorithme de hash inconnu: {algorithm} (valeurs possibles: {', '.join(ROW_HASH_TYPES)})")
+
+def hash_dataframe_rows(df, hash_function, exclude_columns=()):
+    """
+    Calcule en une passe les hashes de toutes les lignes d'un DataFrame avec une fonction de row_hash_function
+    (les colonnes de exclude_columns, horodatages ou valeurs recalculées, n'entrent pas dans le hash)
+    """
+    if exclude_columns:
+        df = df.drop(columns=[col for col in exclude_columns if col in df.columns])
+    if hash_function is None:
+        # Hash 64 bits calculé en C sur le texte des valeurs (valeurs manquantes écrites 'nan'
+        # comme str(), quelle que soit la version de pandas)
+        return pd.util.hash_pandas_object(df.astype(str).fillna('nan'), index=False).tolist()
+    # Lignes de to_numpy() et non zip des colonnes: comme les Series de iterrows, une ligne d'un
+    # DataFrame entièrement numérique passe en float64 (1 devient '1.0'), ce que reflètent les hashes stockés.
+    # tolist() en fait des scalaires Python, dont str() est plus rapide et identique à celui de numpy
+    join = '|'.join
+    return [hash_function(join(map(str, values)).encode()) for values in df.to_numpy().tolist()]
+
+def scan_byte_range(csv_file, start, end, columns, encoding, separator):
+    """
+    Résume les types déduits de la tranche d'octets [start, end) d'un CSV (exécuté dans un processus de travail)
+    """
+    return csv_dtype_summary(parse_csv_bytes(read_byte_range(csv_file, start, end), columns, encoding, separator))
+
+def parse_byte_range(csv_file, start, end, columns, encoding, separator, dtypes, hash_algorithm, hash_exclude_columns=()):
+    """
+    Analyse la tranche d'octets [start, end) d'un CSV avec les types de tout le fichier et hashe ses lignes
+    (exécuté dans un processus de travail)
+    """
+    df = parse_csv_bytes(read_byte_range(csv_file, start, end), columns, encoding, separator, dtypes)
+    return df, hash_dataframe_rows(df, row_hash_function(hash_algorithm), hash_exclude_columns)
+
+def sync_state_key(table_name, csv_file):
+    """
+    Clé de l'état de reprise d'un fichier synchronisé vers une table: la position de lecture ne vaut
+    que pour la table qui a reçu les lignes déjà lues (les noms de table ne contiennent pas ':')
+    """
+    return f"{table_name}:{os.path.abspath(csv_file)}"
+
+def sync_csv_worker(config_file, csv_file, table_name, entry):
+    """
+    Synchronise un fichier dans un processus de travail, avec sa propre connexion MySQL, et retourne
+    le nombre de lignes insérées et le nouvel état de reprise du fichier
+    """
+    csv_mysql = CSVtoMySQL(config_file)
+    if not csv_mysql.connect():
+        raise ConnectionError(f"Connexion MySQL impossible pour synchroniser {csv_file}")
+    try:
+        key = sync_state_key(table_name, csv_file)
+        state = {} if entry is None else {key: entry}
+        rows_inserted = csv_mysql.sync_csv_file(csv_file, table_name, state, save_state=False)
+        return rows_inserted, state.get(key)
+    finally:
+        csv_mysql.disconnect()
 
 class CSVtoMySQL:
     def __init__(self, config_file='config.json'):
         """
         Initialise la connexion à MySQL en utilisant un fichier de configuration JSON
         """
+        self.config_file = config_file
         self.config = self.load_config(config_file)
         self.connection = None
         self.cursor = None
+        self.connection_config = None
+        self.local_infile = self.config.get('database', {}).get('local_infile', True)
+        self.prepared_statements = self.config.get('database', {}).get('prepared_statements', False)
+        self.strict_values = self.config.get('database', {}).get('strict_values', False)
+        self.prepared_cursors = {}
+        self.insert_queries = {}
+        self.file_info_cache = {}
+        self.batch_size = self.config.get('database', {}).get('batch_size', BATCH_SIZE)
+        self.max_allowed_packet = None
+        # Plusieurs connexions n'aident que sur le réseau, où chacune attend la réponse du serveur
+        self.pool_size = self.config.get('database', {}).get(
+            'pool_size',
+            1 if self.config.get('database', {}).get('host') in LOCAL_HOSTS else POOL_SIZE
+        )
+        self.hash_algorithm = self.config.get('csv', {}).get('hash_algorithm', 'md5')
+        # Paramètres CSV lus à chaque analyse: extraits une fois de la configuration
+        self.csv_encoding = self.config.get('csv', {}).get('encoding', 'utf-8')
+        self.csv_separator = self.config.get('csv', {}).get('separator', ',')
+        self.default_table_name = self.config.get('csv', {}).get('default_table_name', 'csv_data')
+        self.hash_function = row_hash_function(self.hash_algorithm)
+        self.hash_exclude_columns = self.config.get('csv', {}).get('hash_exclude_columns', [])
         
-        # Configuration du logging
+        # Configuration du logging (une seule fois par processus: chaque instance rouvrait le fichier)
         log_config = self.config.get('logging', {})
-        logging.basicConfig(
-            level=getattr(logging, log_config.get('level', 'INFO')),
-            format=log_config.get('format', '%(asctime)s - %(levelname)s - %(message)s'),
-            handlers=[
-                logging.FileHandler(log_config.get('file', 'csv_mysql.log')),
-                logging.StreamHandler()
-            ]
-        )
+        if not logging.getLogger().handlers:
+            file_handler = logging.handlers.MemoryHandler(
+                LOG_BUFFER_RECORDS,
+                flushLevel=logging.WARNING,
+                target=logging.FileHandler(log_config.get('file', 'csv_mysql.log'))
+            )
+            logging.basicConfig(
+                level=getattr(logging, log_config.get('level', 'INFO')),
+                format=log_config.get('format', '%(asctime)s - %(levelname)s - %(message)s'),
+                handlers=[file_handler, logging.StreamHandler()]
+            )
+            # Le format est posé sur le MemoryHandler: le FileHandler cible doit le recevoir aussi
+            file_handler.target.setFormatter(file_handler.formatter)
         self.logger = logging.getLogger(__name__)
     
     def find_latest_csv(self, directory=None, pattern=None):
         """
         Trouve le fichier CSV le plus récent dans le dossier spécifié
         """
-        import glob
-        
         if directory is None:
             directory = self.config.get('csv', {}).get('scan_directory', './csv_files')
         
@@ -45,23 +317,37 @@ class CSVtoMySQL:
             self.logger.info(f"Dossier créé: {directory}")
             return None
         
-        # Rechercher les fichiers CSV
-        search_pattern = os.path.join(directory, pattern)
-        csv_files = glob.glob(search_pattern)
-        
+        csv_files = self.list_csv_files(directory, pattern)
         if not csv_files:
             self.logger.warning(f"Aucun fichier CSV trouvé dans {directory} avec le pattern {pattern}")
             return None
         
-        # Trouver le plus récent
-        latest_file = max(csv_files, key=os.path.getmtime)
-        modification_time = datetime.fromtimestamp(os.path.getmtime(latest_file))
+        latest_file, latest_mtime = csv_files[-1]
+        modification_time = datetime.fromtimestamp(latest_mtime)
         
         self.logger.info(f"Fichier CSV le plus récent trouvé: {latest_file}")
         self.logger.info(f"Date de modification: {modification_time}")
         
         return latest_file
     
+    def list_csv_files(self, directory, pattern):
+        """
+        Liste les fichiers CSV du dossier correspondant au pattern, du plus ancien au plus récent,
+        avec leur date de modification
+        """
+        # Un seul parcours du dossier (comme glob, les fichiers cachés ne sont retenus que si le
+        # pattern commence par un point)
+        csv_files = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') and not pattern.startswith('.'):
+                    continue
+                if not fnmatch.fnmatch(entry.name, pattern) or not entry.is_file():
+                    continue
+                csv_files.append((entry.path, entry.stat().st_mtime))
+        csv_files.sort(key=lambda item: item[1])
+        return csv_files
+    
     def get_csv_file_to_process(self, csv_file=None):
         """
         Détermine quel fichier CSV traiter
@@ -112,7 +398,8 @@ class CSVtoMySQL:
                 "user": "root",
                 "password": "",
                 "database": "test",
-                "charset": "utf8mb4"
+                "charset": "utf8mb4",
+                "local_infile": True
             },
             "csv": {
                 "encoding": "utf-8",
@@ -129,7 +416,8 @@ class CSVtoMySQL:
             },
             "monitoring": {
                 "check_interval": 60,
-                "auto_create_table": True
+                "auto_create_table": True,
+                "state_file": "csv_mysql_state.json"
             },
             "data_types": {
                 "varchar_length": 255,
@@ -146,14 +434,33 @@ class CSVtoMySQL:
         """
         try:
             db_config = self.config['database']
-            self.connection = mysql.connector.connect(
-                host=db_config['host'],
-                user=db_config['user'],
-                password=db_config['password'],
-                database=db_config['database'],
-                charset=db_config.get('charset', 'utf8mb4')
-            )
+            # La compression du protocole n'est utile que sur le réseau, pas en local
+            compress = db_config.get('compress', db_config['host'] not in LOCAL_HOSTS)
+            connection_config = {
+                'host': db_config['host'],
+                'user': db_config['user'],
+                'password': db_config['password'],
+                'database': db_config['database'],
+                'charset': db_config.get('charset', 'utf8mb4'),
+                # LOAD DATA LOCAL limité au dossier temporaire: le serveur ne peut demander que les fichiers
+                # écrits par load_data_local_infile, pas n'importe quel fichier du client
+                'allow_local_infile': False,
+                'autocommit': False,
+                'compress': compress,
+                # Extension C du connecteur quand elle est installée (repli automatique sur l'implémentation pure)
+                'use_pure': db_config.get('use_pure', False)
+            }
+            if self.local_infile:
+                connection_config['allow_local_infile_in_path'] = tempfile.gettempdir()
+            if not connection_config['use_pure'] and not mysql.connector.HAVE_CEXT:
+                self.logger.info(
+                    "Extension C de mysql-connector non installée: les INSERT (repli de LOAD DATA) "
+                    "échapperont les valeurs en Python"
+                )
+            self.connection = mysql.connector.connect(**connection_config)
             self.cursor = self.connection.cursor()
+            # Réglages des connexions ouvertes par les threads d'insertion, en plus de la connexion principale
+            self.connection_config = connection_config
             self.logger.info("Connexion à MySQL établie avec succès")
             return True
         except mysql.connector.Error as err:
@@ -167,52 +474,275 @@ class CSVtoMySQL:
         """
         Ferme la connexion à MySQL
         """
+        for cursor, _ in self.prepared_cursors.values():
+            cursor.close()
+        self.prepared_cursors = {}
         if self.cursor:
             self.cursor.close()
         if self.connection:
             self.connection.close()
         self.logger.info("Connexion MySQL fermée")
     
-    def create_table_from_csv(self, csv_file, table_name):
+    def cached_file_info(self, csv_file, kind, compute):
         """
-        Crée une table MySQL basée sur la structure du CSV
+        Retourne une information déduite du CSV (en-tête, types des colonnes), recalculée par compute
+        seulement si le fichier a changé depuis le dernier calcul
         """
-        try:
-            # Configuration CSV
-            csv_config = self.config.get('csv', {})
-            data_types_config = self.config.get('data_types', {})
-            
-            # Lire le CSV pour analyser la structure
-            df = pd.read_csv(
-                csv_file,
-                encoding=csv_config.get('encoding', 'utf-8'),
-                sep=csv_config.get('separator', ',')
+        file_stat = os.stat(csv_file)
+        stamp = (file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+        key = (os.path.abspath(csv_file), kind)
+        cached = self.file_info_cache.get(key)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, compute(csv_file))
+            self.file_info_cache[key] = cached
+        return cached[1]
+    
+    def csv_columns(self, csv_file):
+        """
+        Retourne les noms des colonnes de l'en-tête du CSV
+        """
+        return self.cached_file_info(csv_file, 'columns', lambda path: list(pd.read_csv(
+            path,
+            nrows=0,
+            encoding=self.csv_encoding,
+            sep=self.csv_separator
+        ).columns))
+    
+    def read_csv(self, csv_file, chunksize=None, dtypes=None):
+        """
+        Lit un CSV avec le moteur C de pandas, le seul utilisé: les types qu'il déduit, et donc les
+        hashes des lignes, sont ceux des tables déjà remplies (dtypes impose ceux de csv_dtypes)
+        """
+        return pd.read_csv(
+            csv_file,
+            engine='c',
+            low_memory=False,
+            chunksize=chunksize,
+            dtype=csv_read_dtypes(dtypes),
+            encoding=self.csv_encoding,
+            sep=self.csv_separator
+        )
+    
+    def csv_byte_ranges(self, csv_file):
+        """
+        Découpe le corps du CSV (après l'en-tête) en tranches d'environ RANGE_BYTES alignées sur les fins de ligne
+        """
+        size = os.path.getsize(csv_file)
+        with open(csv_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            bounds = [mapped.find(b'\n') + 1]
+            while bounds[-1] < size:
+                newline = mapped.find(b'\n', bounds[-1] + RANGE_BYTES)
+                bounds.append(size if newline == -1 else newline + 1)
+        return list(zip(bounds, bounds[1:]))
+    
+    def map_byte_ranges(self, csv_file, workers, function, *args):
+        """
+        Applique function(csv_file, start, end, *args) à chaque tranche d'octets du CSV dans des processus
+        de travail, et restitue les résultats dans l'ordre du fichier
+        """
+        ranges = iter(self.csv_byte_ranges(csv_file))
+        # spawn: appelé depuis le thread producteur, les processus ne doivent hériter ni de la connexion
+        # MySQL ni de l'état des autres threads de ce processus
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            # Au plus deux tranches d'avance par processus, pour borner la mémoire
+            pending = deque()
+            for start, end in ranges:
+                pending.append(executor.submit(function, csv_file, start, end, *args))
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                next_range = next(ranges, None)
+                if next_range is not None:
+                    pending.append(executor.submit(function, csv_file, *next_range, *args))
+                yield result
+    
+    def csv_dtypes(self, csv_file):
+        """
+        Types des colonnes tels que les déduit une lecture du CSV en une fois par le moteur C, imposés
+        à chaque bloc quand le fichier est lu par parties (une passe d'analyse, sans garder les lignes)
+        """
+        def scan(path):
+            parse_workers = self.config.get('csv', {}).get('parse_workers', 1)
+            if parse_workers > 1:
+                summaries = self.map_byte_ranges(
+                    path, parse_workers, scan_byte_range,
+                    self.csv_columns(path), self.csv_encoding, self.csv_separator
+                )
+            else:
+                chunk_size = self.config.get('csv', {}).get('chunk_size', CHUNK_SIZE)
+                summaries = (csv_dtype_summary(df) for df in self.read_csv(path, chunksize=chunk_size))
+            summary = ({}, set())
+            for chunk_summary in summaries:
+                summary = merge_csv_dtypes(summary, chunk_summary)
+            return summary[0]
+        return self.cached_file_info(csv_file, 'dtypes', scan)
+    
+    def iter_csv_byte_ranges(self, csv_file, workers):
+        """
+        Analyse et hashe le CSV en parallèle, une tranche d'octets par tâche, et restitue les blocs
+        (df, hashes) dans l'ordre du fichier (les champs entre guillemets ne doivent pas contenir de retour à la ligne)
+        """
+        yield from self.map_byte_ranges(
+            csv_file, workers, parse_byte_range,
+            self.csv_columns(csv_file), self.csv_encoding, self.csv_separator,
+            self.csv_dtypes(csv_file), self.hash_algorithm, self.hash_exclude_columns
+        )
+    
+    def is_large_file(self, csv_file):
+        """
+        Indique si le CSV dépasse csv.large_file_mb et doit être lu par blocs plutôt qu'en une fois
+        """
+        large_file_mb = self.config.get('csv', {}).get('large_file_mb', LARGE_FILE_MB)
+        return os.path.getsize(csv_file) > large_file_mb * 1024 * 1024
+    
+    def iter_csv_chunks(self, csv_file):
+        """
+        Lit le CSV en un seul DataFrame, ou par blocs si le fichier est volumineux
+        """
+        if not self.is_large_file(csv_file):
+            df = self.read_csv(csv_file)
+            # Types de la lecture complète, gardés dans l'état de reprise pour lire la suite du fichier
+            self.cached_file_info(csv_file, 'dtypes', lambda path: csv_dtype_summary(df)[0])
+            yield df
+            return
+        
+        # Chaque bloc ne voit qu'une partie des valeurs: les types déduits de tout le fichier lui sont
+        # imposés, pour que ses lignes aient les mêmes valeurs (et hashes) qu'en une seule lecture
+        yield from self.read_csv(
+            csv_file,
+            chunksize=self.config.get('csv', {}).get('chunk_size', CHUNK_SIZE),
+            dtypes=self.csv_dtypes(csv_file)
+        )
+    
+    def iter_csv_hashed_chunks(self, csv_file):
+        """
+        Lit le CSV bloc par bloc avec les hashes de chaque bloc; avec csv.parse_workers > 1, les fichiers
+        volumineux sont analysés et hashés dans les processus de travail
+        """
+        parse_workers = self.config.get('csv', {}).get('parse_workers', 1)
+        if parse_workers > 1 and self.is_large_file(csv_file):
+            yield from self.iter_csv_byte_ranges(csv_file, parse_workers)
+            return
+        
+        for df in self.iter_csv_chunks(csv_file):
+            yield df, self.compute_row_hashes(df)
+    
+    def table_exists(self, table_name):
+        """
+        Indique si la table existe dans la base courante
+        """
+        self.cursor.execute(
+            "SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table_name,)
+        )
+        return self.cursor.fetchone() is not None
+    
+    def check_row_hash_column(self, table_name):
+        """
+        Vérifie que la colonne row_hash d'une table existante a été remplie avec hash_algorithm, et lève
+        ValueError sinon: les lignes déjà présentes ne seraient pas reconnues, ou des hashes distincts
+        seraient tronqués en une même valeur
+        """
+        self.cursor.execute(
+            "SELECT DATA_TYPE, CHARACTER_MAXIMUM_LENGTH, COLUMN_COMMENT FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = 'row_hash'",
+            (table_name,)
+        )
+        column = self.cursor.fetchone()
+        if column is None:
+            return
+        data_type, length, comment = column
+        
+        # Algorithme enregistré en commentaire de la colonne par create_table_from_dataframe
+        if comment in ROW_HASH_TYPES:
+            if comment != self.hash_algorithm:
+                raise ValueError(
+                    f"La table '{table_name}' a été remplie avec hash_algorithm '{comment}', "
+                    f"la configuration indique '{self.hash_algorithm}'"
+                )
+            return
+        
+        # Table sans commentaire (créée par une version antérieure): l'algorithme se déduit du type de la colonne
+        def matches(algorithm):
+            # 'VARCHAR(64)' -> ('varchar', '64'), 'BIGINT UNSIGNED' -> ('bigint', '')
+            expected, _, expected_length = ROW_HASH_TYPES[algorithm].split(' ')[0].lower().rstrip(')').partition('(')
+            return str(data_type).lower() == expected and (not expected_length or length == int(expected_length))
+        
+        candidates = [algorithm for algorithm in ROW_HASH_TYPES if matches(algorithm)]
+        if candidates != [self.hash_algorithm]:
+            row_hash_type = ROW_HASH_TYPES[self.hash_algorithm]
+            raise ValueError(
+                f"La colonne row_hash de '{table_name}' ({data_type}) ne permet pas de vérifier qu'elle a été "
+                f"remplie avec hash_algorithm '{self.hash_algorithm}' (algorithmes possibles: "
+                f"{', '.join(candidates) or 'aucun'}). Si c'est le cas, l'enregistrer avec: ALTER TABLE "
+                f"{quote_table_name(table_name)} MODIFY `row_hash` {row_hash_type} COMMENT '{self.hash_algorithm}'"
             )
-            
+    
+    def table_is_empty(self, table_name):
+        """
+        Indique si la table ne contient encore aucune ligne
+        """
+        self.cursor.execute(f"SELECT 1 FROM {quote_table_name(table_name)} LIMIT 1")
+        return self.cursor.fetchone() is None
+    
+    def mysql_column_type(self, kind):
+        """
+        Type MySQL d'une colonne selon la famille de son dtype (entier, flottant, booléen), VARCHAR sinon
+        """
+        data_types_config = self.config.get('data_types', {})
+        decimal_precision = data_types_config.get('decimal_precision', '10,2')
+        types_by_kind = {
+            # int64: des valeurs au-delà de 2^31 sont possibles, qu'un INT tronquerait
+            'i': 'BIGINT',
+            # pandas ne déduit uint64 que pour une valeur au-delà de 2^63-1
+            'u': 'BIGINT UNSIGNED',
+            'f': f'DECIMAL({decimal_precision})',
+            'b': 'BOOLEAN'
+        }
+        return types_by_kind.get(kind, f"VARCHAR({data_types_config.get('varchar_length', 255)})")
+    
+    def widen_columns(self, table_name, previous_dtypes, dtypes):
+        """
+        Élargit (ALTER TABLE ... MODIFY) les colonnes d'une table créée d'après le CSV dont le type
+        déduit a changé depuis previous_dtypes, et retourne les colonnes modifiées
+        """
+        def column_type(name):
+            return self.mysql_column_type('O' if name == 'str' else pd.api.types.pandas_dtype(name).kind)
+        
+        widened = [
+            col for col, name in dtypes.items()
+            if col in previous_dtypes and column_type(name) != column_type(previous_dtypes[col])
+        ]
+        if widened:
+            modifications = ', '.join(f"MODIFY {quote_identifier(col)} {column_type(dtypes[col])}" for col in widened)
+            self.cursor.execute(f"ALTER TABLE {quote_table_name(table_name)} {modifications}")
+        return widened
+    
+    def create_table_from_dataframe(self, df, table_name, unique_hash=True):
+        """
+        Crée une table MySQL basée sur les colonnes et les types d'un DataFrame déjà lu
+        (unique_hash=False crée row_hash sans index UNIQUE, à ajouter avec add_row_hash_index)
+        """
+        try:
             # Construire la requête CREATE TABLE
             columns = []
-            varchar_length = data_types_config.get('varchar_length', 255)
-            decimal_precision = data_types_config.get('decimal_precision', '10,2')
             
-            for col in df.columns:
-                # Déterminer le type de données
-                if df[col].dtype == 'int64':
-                    col_type = 'INT'
-                elif df[col].dtype == 'float64':
-                    col_type = f'DECIMAL({decimal_precision})'
-                elif df[col].dtype == 'bool':
-                    col_type = 'BOOLEAN'
-                else:
-                    col_type = f'VARCHAR({varchar_length})'
-                
-                columns.append(f"`{col}` {col_type}")
+            # Les dtypes viennent de l'analyse déjà faite pour calculer row_hash: une inférence côté
+            # serveur (table de transit en TEXT) ne dispenserait pas de cette lecture.
+            # Une seule passe sur les dtypes déjà inférés, sans extraire chaque colonne
+            for col, dtype in df.dtypes.items():
+                columns.append(f"{quote_identifier(col)} {self.mysql_column_type(dtype.kind)}")
             
             # Ajouter les colonnes système
-            columns.append("`row_hash` VARCHAR(64) UNIQUE")
+            # L'algorithme est enregistré en commentaire de row_hash, vérifié par check_row_hash_column
+            row_hash_type = ROW_HASH_TYPES[self.hash_algorithm]
+            row_hash_column = f"`row_hash` {row_hash_type} UNIQUE" if unique_hash else f"`row_hash` {row_hash_type}"
+            columns.append(f"{row_hash_column} COMMENT '{self.hash_algorithm}'")
             columns.append("`created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
             
             create_query = f"""
-            CREATE TABLE IF NOT EXISTS `{table_name}` (
+            CREATE TABLE IF NOT EXISTS {quote_table_name(table_name)} (
                 `id` INT AUTO_INCREMENT PRIMARY KEY,
                 {', '.join(columns)}
             )
@@ -226,27 +756,439 @@ class CSVtoMySQL:
             self.logger.error(f"Erreur lors de la création de la table: {e}")
             raise
     
-    def generate_row_hash(self, row):
+    def compute_row_hashes(self, df):
+        """
+        Calcule en une passe les hashes de toutes les lignes d'un DataFrame
         """
-        Génère un hash unique pour une ligne de données
+        return hash_dataframe_rows(df, self.hash_function, self.hash_exclude_columns)
+    
+    def build_insert_queries(self, columns, table_name):
+        """
+        Construit une seule fois les requêtes LOAD DATA et INSERT pour un jeu de colonnes
+        (gardées pour les passages suivants de la surveillance sur la même table)
+        """
+        key = (table_name, tuple(columns))
+        if key in self.insert_queries:
+            return self.insert_queries[key]
+        
+        columns_str = ', '.join([quote_identifier(col) for col in list(columns) + ['row_hash']])
+        placeholders = ', '.join(['%s'] * (len(columns) + 1))
+        
+        load_query = f"""
+        LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE {quote_table_name(table_name)}
+        CHARACTER SET utf8mb4
+        FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+        LINES TERMINATED BY '\\n'
+        ({columns_str})
         """
-        row_string = '|'.join(str(value) for value in row.values)
-        return hashlib.md5(row_string.encode()).hexdigest()
+        # VALUES et la parenthèse sur la même ligne: le connecteur réécrit alors le lot en INSERT multi-lignes
+        insert_query = f"INSERT IGNORE INTO {quote_table_name(table_name)} ({columns_str}) VALUES ({placeholders})"
+        
+        self.insert_queries[key] = {'load': load_query, 'insert': insert_query}
+        return self.insert_queries[key]
     
-    def get_existing_hashes(self, table_name):
+    def load_data_local_infile(self, df, hashes, load_query):
         """
-        Récupère tous les hashes existants dans la table
+        Charge les lignes d'un DataFrame avec LOAD DATA LOCAL INFILE via un fichier temporaire
         """
+        # Ne convertir que les colonnes qui l'exigent: les autres sont écrites telles quelles depuis df
+        converted = {}
+        for col, series in df.items():
+            if series.dtype == 'bool':
+                converted[col] = series.astype(int)
+            elif pd.api.types.is_string_dtype(series):
+                # Le backslash est le caractère d'échappement de LOAD DATA (remplacement vectorisé)
+                converted[col] = series.str.replace('\\', '\\\\', regex=False)
+            elif not pd.api.types.is_numeric_dtype(series):
+                converted[col] = series.map(lambda v: v.replace('\\', '\\\\') if isinstance(v, str) else v)
+        data = df.assign(**converted, row_hash=hashes)
+        
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8', newline='', delete=False) as tmp:
+            data.to_csv(tmp, index=False, header=False, na_rep='\\N', lineterminator='\n')
         try:
-            query = f"SELECT row_hash FROM `{table_name}`"
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
-            return set(row[0] for row in results)
-        except mysql.connector.Error as err:
-            if "doesn't exist" in str(err):
-                return set()
+            self.cursor.execute(load_query, (tmp.name,))
+            rows_inserted = self.cursor.rowcount
+            self.check_insert_warnings(self.cursor.warning_count, len(data), rows_inserted)
+            return rows_inserted
+        finally:
+            os.remove(tmp.name)
+    
+    def check_insert_warnings(self, warning_count, rows_sent, rows_inserted):
+        """
+        Signale les valeurs converties ou tronquées par le dernier LOAD DATA ou INSERT IGNORE de la connexion
+        (IGNORE les change en avertissements, seuls ceux des doublons de row_hash sont attendus): écrit un
+        avertissement dans le log, ou lève une erreur avec database.strict_values
+        """
+        # Chaque ligne écartée comme doublon donne exactement un avertissement: pas d'autre à lire
+        if warning_count <= rows_sent - rows_inserted:
+            return
+        # Lus par le curseur ordinaire: SHOW WARNINGS sur un curseur préparé remplacerait sa requête préparée
+        self.cursor.execute("SHOW WARNINGS")
+        warnings = self.cursor.fetchall()
+        # Les notes (arrondi d'un DECIMAL) ne changent pas la valeur au-delà de la précision de la colonne
+        problems = [w for w in warnings if w[1] != DUPLICATE_KEY_ERRNO and w[0] != 'Note']
+        if not problems and warning_count > len(warnings):
+            # Liste tronquée à max_error_count: plus d'avertissements que de lignes écartées comme doublons
+            problems = [('Warning', None, f"{warning_count} avertissements pour {rows_sent - rows_inserted} doublons")]
+        if problems:
+            level, code, message = problems[0]
+            message = (
+                f"Valeurs modifiées par MySQL à l'insertion ({len(problems)} avertissement(s), premier: {code} {message}): "
+                f"le type d'une colonne ne convient pas aux données du CSV"
+            )
+            if self.strict_values:
+                raise ValueError(message)
+            self.logger.warning(message)
+    
+    def dataframe_rows(self, df, hashes):
+        """
+        Convertit un DataFrame en tuples de paramètres (valeurs + row_hash) pour executemany
+        """
+        # Chaque colonne est convertie d'un bloc en liste Python (tolist boucle en C), les valeurs
+        # manquantes devenant None (NULL), puis zip transpose les colonnes en lignes
+        columns = []
+        for _, series in df.items():
+            if series.hasnans:
+                series = series.astype(object).where(series.notna(), None)
+            columns.append(series.tolist())
+        columns.append(hashes)
+        return list(zip(*columns))
+    
+    def packet_batch_size(self, rows):
+        """
+        Nombre de lignes par requête multi-lignes tenant dans max_allowed_packet, d'après la taille
+        moyenne des PACKET_SAMPLE_ROWS premières lignes
+        """
+        if self.max_allowed_packet is None:
+            self.cursor.execute("SELECT @@max_allowed_packet")
+            self.max_allowed_packet = self.cursor.fetchone()[0]
+        sample = rows[:PACKET_SAMPLE_ROWS]
+        if not sample:
+            return self.batch_size
+        # Texte SQL approché d'une ligne: valeurs, guillemets et séparateurs
+        row_bytes = sum(len(str(value)) + 4 for row in sample for value in row) / len(sample) + 2
+        # Moitié du paquet seulement: marge pour l'échappement et les lignes plus longues que la moyenne
+        return max(1, int(self.max_allowed_packet / 2 // row_bytes))
+    
+    def execute_prepared_batch(self, insert_query, batch, batch_size):
+        """
+        Insère un lot en une requête multi-lignes préparée côté serveur: la requête des lots complets
+        est préparée une fois par requête d'insertion, celle du dernier lot, plus court, est fermée après usage
+        """
+        # insert_query se termine par "VALUES (%s, ...)": répéter ce groupe pour chaque ligne du lot
+        head, row_placeholders = insert_query.rsplit(' VALUES ', 1)
+        statement = f"{head} VALUES {', '.join([row_placeholders] * len(batch))}"
+        if len(batch) == batch_size:
+            cached = self.prepared_cursors.get(insert_query)
+            if cached is None or cached[1] != statement:
+                # La taille des lots complets a changé (autre max_allowed_packet estimé): libérer l'ancienne
+                if cached is not None:
+                    cached[0].close()
+                cached = self.prepared_cursors[insert_query] = (self.connection.cursor(prepared=True), statement)
+            # Le curseur ne prépare de nouveau que si on lui passe un autre objet chaîne (test d'identité,
+            # pas d'égalité): réutiliser la chaîne gardée, pas celle reconstruite à l'instant
+            cursor, statement = cached
+        else:
+            cursor = self.connection.cursor(prepared=True)
+        
+        try:
+            cursor.execute(statement, [value for row in batch for value in row])
+            rows_inserted = cursor.rowcount
+            self.check_insert_warnings(cursor.warning_count, len(batch), rows_inserted)
+        finally:
+            if len(batch) != batch_size:
+                cursor.close()
+        return rows_inserted
+    
+    def insert_rows(self, df, hashes, insert_query):
+        """
+        Insère les lignes d'un DataFrame par lots avec executemany et INSERT IGNORE
+        """
+        rows = self.dataframe_rows(df, hashes)
+        
+        batch_size = min(self.batch_size, self.packet_batch_size(rows))
+        if self.prepared_statements:
+            # Une requête préparée accepte au plus MAX_PREPARED_PARAMS paramètres
+            batch_size = max(1, min(batch_size, MAX_PREPARED_PARAMS // (len(df.columns) + 1)))
+        
+        rows_inserted = 0
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                if self.prepared_statements:
+                    rows_inserted += self.execute_prepared_batch(insert_query, batch, batch_size)
+                else:
+                    self.cursor.executemany(insert_query, batch)
+                    batch_inserted = self.cursor.rowcount
+                    self.check_insert_warnings(self.cursor.warning_count, len(batch), batch_inserted)
+                    rows_inserted += batch_inserted
+            except mysql.connector.Error as err:
+                # Rejouer le lot ligne par ligne pour isoler la ligne fautive
+                if err.errno == LOCK_DEADLOCK_ERRNO:
+                    # La transaction entière est annulée: c'est à l'appelant de rejouer le bloc
+                    raise
+                failed_rows = 0
+                first_error = None
+                for offset, values in enumerate(batch):
+                    try:
+                        self.cursor.execute(insert_query, values)
+                        row_inserted = self.cursor.rowcount
+                        self.check_insert_warnings(self.cursor.warning_count, 1, row_inserted)
+                        rows_inserted += row_inserted
+                    except mysql.connector.Error as row_err:
+                        failed_rows += 1
+                        if first_error is None:
+                            first_error = f"ligne {start + offset}: {row_err}"
+                # Un seul message par lot plutôt qu'une écriture de log par ligne en échec
+                self.logger.warning(
+                    f"Erreur lors de l'insertion du lot {start}-{start + len(batch) - 1} ({err}): "
+                    f"{failed_rows} ligne(s) rejetée(s)" + (f", première erreur {first_error}" if first_error else "")
+                )
+        
+        return rows_inserted
+    
+    def insert_dataframe(self, df, hashes, table_name, queries=None):
+        """
+        Insère les lignes d'un DataFrame, par LOAD DATA LOCAL INFILE si le serveur l'autorise
+        """
+        if queries is None:
+            queries = self.build_insert_queries(df.columns, table_name)
+        
+        if self.local_infile:
+            try:
+                return self.load_data_local_infile(df, hashes, queries['load'])
+            except mysql.connector.Error as err:
+                if err.errno not in LOCAL_INFILE_ERRNOS:
+                    raise
+                self.local_infile = False
+                self.logger.warning(f"LOAD DATA LOCAL INFILE refusé ({err}), utilisation des INSERT")
+        
+        return self.insert_rows(df, hashes, queries['insert'])
+    
+    @contextmanager
+    def bulk_load_session(self):
+        """
+        Règle la session MySQL pour un chargement massif, puis restaure les valeurs d'origine
+        (unique_checks reste actif: l'index UNIQUE sur row_hash assure le dédoublonnage)
+        """
+        self.cursor.execute("SELECT @@SESSION.foreign_key_checks, @@SESSION.bulk_insert_buffer_size")
+        previous = self.cursor.fetchone()
+        self.cursor.execute(
+            "SET SESSION foreign_key_checks = 0, bulk_insert_buffer_size = %s",
+            (BULK_INSERT_BUFFER_SIZE,)
+        )
+        try:
+            yield
+        finally:
+            self.cursor.execute(
+                "SET SESSION foreign_key_checks = %s, bulk_insert_buffer_size = %s",
+                previous
+            )
+    
+    def iter_hashed_chunks(self, csv_file):
+        """
+        Lit et hashe les blocs du CSV dans un thread producteur, pendant que l'appelant insère les précédents
+        """
+        chunks = queue.Queue(maxsize=PIPELINE_DEPTH)
+        stop = threading.Event()
+        
+        def produce():
+            try:
+                for chunk in self.iter_csv_hashed_chunks(csv_file):
+                    if stop.is_set():
+                        return
+                    chunks.put(chunk)
+                chunks.put(None)
+            except Exception as e:
+                chunks.put(e)
+        
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = chunks.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Arrêter le producteur et le débloquer s'il attend une place dans la file
+            stop.set()
+            while producer.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+    
+    def drop_seen_rows(self, df, hashes, seen_hashes):
+        """
+        Retire les lignes dont le hash est déjà dans seen_hashes (chargement sans index UNIQUE, ou parts
+        d'un même bloc insérées en parallèle) et y ajoute les autres
+        """
+        keep = []
+        for row_hash in hashes:
+            keep.append(row_hash not in seen_hashes)
+            seen_hashes.add(row_hash)
+        if all(keep):
+            return df, hashes
+        return df[keep], [row_hash for row_hash, kept in zip(hashes, keep) if kept]
+    
+    def drop_row_hash_index(self, table_name):
+        """
+        Supprime l'index UNIQUE sur row_hash s'il existe, et indique s'il a été supprimé
+        """
+        self.cursor.execute(f"SHOW INDEX FROM {quote_table_name(table_name)} WHERE Key_name = 'row_hash'")
+        if not self.cursor.fetchall():
+            return False
+        self.cursor.execute(f"ALTER TABLE {quote_table_name(table_name)} DROP INDEX `row_hash`")
+        return True
+    
+    def add_row_hash_index(self, table_name):
+        """
+        Construit en une passe l'index UNIQUE sur row_hash d'une table chargée sans lui
+        """
+        self.cursor.execute(f"ALTER TABLE {quote_table_name(table_name)} ADD UNIQUE KEY `row_hash` (`row_hash`)")
+        self.logger.info(f"Index UNIQUE sur row_hash construit pour '{table_name}'")
+    
+    def open_insert_worker(self):
+        """
+        Retourne une copie de l'instance branchée sur une nouvelle connexion, pour insérer depuis un autre thread
+        (connexion fermée par insert_chunks_pooled à la fin du chargement)
+        """
+        worker = copy.copy(self)
+        worker.connection = mysql.connector.connect(**self.connection_config)
+        worker.cursor = worker.connection.cursor()
+        worker.prepared_cursors = {}
+        # Réglages de chargement massif, propres à cette connexion
+        worker.cursor.execute(
+            "SET SESSION foreign_key_checks = 0, bulk_insert_buffer_size = %s",
+            (BULK_INSERT_BUFFER_SIZE,)
+        )
+        return worker
+    
+    def insert_chunk_committed(self, df, hashes, table_name, queries):
+        """
+        Insère un bloc dans sa propre transaction, rejouée si InnoDB l'annule sur un interblocage
+        """
+        for attempt in range(DEADLOCK_RETRIES):
+            try:
+                rows_inserted = self.insert_dataframe(df, hashes, table_name, queries)
+                self.connection.commit()
+                return rows_inserted
+            except mysql.connector.Error as err:
+                if err.errno != LOCK_DEADLOCK_ERRNO or attempt == DEADLOCK_RETRIES - 1:
+                    raise
+                self.logger.warning(f"Interblocage lors de l'insertion d'un bloc, nouvel essai: {err}")
+    
+    def insert_chunks_pooled(self, chunks, table_name):
+        """
+        Répartit l'insertion des blocs (df, hashes, requêtes) entre pool_size connexions, une par thread
+        """
+        local = threading.local()
+        workers = []
+        
+        def insert(df, hashes, queries):
+            if not hasattr(local, 'worker'):
+                local.worker = self.open_insert_worker()
+                workers.append(local.worker)
+            # Chaque bloc est validé à part: des transactions ouvertes jusqu'à la fin du fichier
+            # bloqueraient les autres connexions sur les verrous de l'index UNIQUE
+            return local.worker.insert_chunk_committed(df, hashes, table_name, queries)
+        
+        rows_inserted = 0
+        pending = deque()
+        try:
+            with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+                try:
+                    for df, hashes, queries in chunks:
+                        # Bloc découpé en une part par connexion (d'au moins batch_size lignes), pour
+                        # que même un fichier lu en un seul bloc soit inséré en parallèle
+                        shard_rows = max(self.batch_size, -(-len(df) // self.pool_size))
+                        for start in range(0, len(df), shard_rows):
+                            # Au plus une part en attente par connexion, pour borner la mémoire
+                            if len(pending) >= self.pool_size:
+                                rows_inserted += pending.popleft().result()
+                            pending.append(executor.submit(
+                                insert, df.iloc[start:start + shard_rows], hashes[start:start + shard_rows], queries
+                            ))
+                    while pending:
+                        rows_inserted += pending.popleft().result()
+                finally:
+                    for future in pending:
+                        future.cancel()
+        finally:
+            # Fermer les connexions des threads (le serveur annule une transaction interrompue)
+            for worker in workers:
+                for cursor, _ in worker.prepared_cursors.values():
+                    cursor.close()
+                worker.cursor.close()
+                worker.connection.close()
+        return rows_inserted
+    
+    def insert_csv_file(self, csv_file, table_name, create_table=False, defer_unique_index=False):
+        """
+        Insère toutes les lignes du CSV, bloc par bloc, et retourne le nombre de lignes insérées
+        (avec create_table, la table est d'abord créée d'après le premier bloc lu, sans relire le fichier;
+        avec defer_unique_index, elle est créée sans index UNIQUE sur row_hash ou l'a déjà perdu, et il est
+        construit après le chargement)
+        """
+        queries = None
+        # Sans index UNIQUE pendant le chargement, les doublons du fichier sont écartés côté client
+        seen_hashes = set() if defer_unique_index else None
+        chunks = self.iter_hashed_chunks(csv_file)
+        
+        def prepared_chunks():
+            nonlocal queries
+            for df, hashes in chunks:
+                # Les colonnes sont les mêmes pour tous les blocs: requêtes construites au premier
+                if queries is None:
+                    if create_table:
+                        self.create_table_from_dataframe(df, table_name, unique_hash=not defer_unique_index)
+                    queries = self.build_insert_queries(df.columns, table_name)
+                if seen_hashes is not None:
+                    df, hashes = self.drop_seen_rows(df, hashes, seen_hashes)
+                elif self.pool_size > 1:
+                    # Les parts d'un bloc sont insérées en même temps par plusieurs connexions: doublons
+                    # écartés dans le bloc (mémoire bornée à un bloc), l'index UNIQUE écarte les autres
+                    df, hashes = self.drop_seen_rows(df, hashes, set())
+                yield df, hashes, queries
+        
+        try:
+            if self.pool_size > 1:
+                # Les blocs sont validés au fil de l'eau par les connexions des threads d'insertion
+                rows_inserted = self.insert_chunks_pooled(prepared_chunks(), table_name)
             else:
-                raise
+                # Tout le fichier dans une seule transaction validée par l'appelant, sauf avec
+                # database.commit_every: validation dès que ce nombre de lignes lues est atteint
+                commit_every = self.config.get('database', {}).get('commit_every')
+                with self.bulk_load_session():
+                    rows_inserted = 0
+                    uncommitted_rows = 0
+                    for df, hashes, chunk_queries in prepared_chunks():
+                        rows_inserted += self.insert_dataframe(df, hashes, table_name, chunk_queries)
+                        uncommitted_rows += len(df)
+                        if commit_every and uncommitted_rows >= commit_every:
+                            self.connection.commit()
+                            uncommitted_rows = 0
+        except Exception:
+            if defer_unique_index:
+                # Même après une erreur, la table ne doit pas rester sans index (il dédoublonne les appends),
+                # mais un échec de sa reconstruction ne doit pas masquer l'erreur d'origine
+                try:
+                    # ALTER TABLE valide implicitement la transaction: annuler d'abord le chargement partiel
+                    self.connection.rollback()
+                    if queries is not None or self.table_exists(table_name):
+                        self.add_row_hash_index(table_name)
+                except Exception as e:
+                    self.logger.error(f"Impossible de reconstruire l'index UNIQUE sur row_hash de '{table_name}': {e}")
+            raise
+        else:
+            if defer_unique_index:
+                self.add_row_hash_index(table_name)
+        finally:
+            chunks.close()
+        return rows_inserted
     
     def import_csv_initial(self, csv_file=None, table_name=None):
         """
@@ -260,50 +1202,32 @@ class CSVtoMySQL:
             
             # Utiliser le nom de table par défaut si non spécifié
             if table_name is None:
-                table_name = self.config.get('csv', {}).get('default_table_name', 'csv_data')
-            
-            # Créer la table si configuré pour le faire
-            if self.config.get('monitoring', {}).get('auto_create_table', True):
-                self.create_table_from_csv(csv_file_to_process, table_name)
+                table_name = self.default_table_name
             
-            # Configuration CSV
-            csv_config = self.config.get('csv', {})
-            
-            # Lire le CSV
-            df = pd.read_csv(
+            # Lire le CSV (par blocs si volumineux) et insérer les données avec hash, en créant
+            # la table d'après le premier bloc si configuré pour le faire
+            auto_create_table = self.config.get('monitoring', {}).get('auto_create_table', True)
+            # Table neuve ou encore vide: l'index UNIQUE est construit en une fois à la fin plutôt que ligne par ligne
+            if self.table_exists(table_name):
+                self.check_row_hash_column(table_name)
+                defer_unique_index = self.table_is_empty(table_name) and self.drop_row_hash_index(table_name)
+            else:
+                defer_unique_index = auto_create_table
+            rows_inserted = self.insert_csv_file(
                 csv_file_to_process,
-                encoding=csv_config.get('encoding', 'utf-8'),
-                sep=csv_config.get('separator', ',')
+                table_name,
+                create_table=auto_create_table,
+                defer_unique_index=defer_unique_index
             )
             
-            # Préparer les données avec hash
-            rows_inserted = 0
-            for index, row in df.iterrows():
-                row_hash = self.generate_row_hash(row)
-                
-                # Préparer les valeurs pour l'insertion
-                values = list(row.values) + [row_hash]
-                placeholders = ', '.join(['%s'] * len(values))
-                columns = list(df.columns) + ['row_hash']
-                columns_str = ', '.join([f"`{col}`" for col in columns])
-                
-                insert_query = f"""
-                INSERT IGNORE INTO `{table_name}` ({columns_str})
-                VALUES ({placeholders})
-                """
-                
-                try:
-                    self.cursor.execute(insert_query, values)
-                    if self.cursor.rowcount > 0:
-                        rows_inserted += 1
-                except mysql.connector.Error as err:
-                    self.logger.warning(f"Erreur lors de l'insertion de la ligne {index}: {err}")
-            
             self.connection.commit()
             self.logger.info(f"Import initial terminé: {rows_inserted} lignes insérées dans '{table_name}' depuis '{csv_file_to_process}'")
             return rows_inserted
             
         except Exception as e:
+            # Ne pas laisser une transaction à moitié chargée, qu'une validation ultérieure enregistrerait
+            if self.connection is not None:
+                self.connection.rollback()
             self.logger.error(f"Erreur lors de l'import initial: {e}")
             raise
     
@@ -319,82 +1243,55 @@ class CSVtoMySQL:
             
             # Utiliser le nom de table par défaut si non spécifié
             if table_name is None:
-                table_name = self.config.get('csv', {}).get('default_table_name', 'csv_data')
+                table_name = self.default_table_name
             
             # Vérifier si la table existe
-            self.cursor.execute(f"SHOW TABLES LIKE '{table_name}'")
-            if not self.cursor.fetchone():
+            if not self.table_exists(table_name):
                 self.logger.info(f"Table '{table_name}' n'existe pas, import initial en cours...")
                 return self.import_csv_initial(csv_file_to_process, table_name)
+            if self.table_is_empty(table_name):
+                self.logger.info(f"Table '{table_name}' vide, import initial en cours...")
+                return self.import_csv_initial(csv_file_to_process, table_name)
             
-            # Récupérer les hashes existants
-            existing_hashes = self.get_existing_hashes(table_name)
-            self.logger.info(f"Nombre de lignes existantes: {len(existing_hashes)}")
-            
-            # Configuration CSV
-            csv_config = self.config.get('csv', {})
-            
-            # Lire le CSV
-            df = pd.read_csv(
-                csv_file_to_process,
-                encoding=csv_config.get('encoding', 'utf-8'),
-                sep=csv_config.get('separator', ',')
-            )
-            
-            # Identifier les nouvelles lignes
-            new_rows = []
-            for index, row in df.iterrows():
-                row_hash = self.generate_row_hash(row)
-                if row_hash not in existing_hashes:
-                    new_rows.append((row, row_hash))
+            # Insérer les lignes: l'index UNIQUE sur row_hash écarte côté serveur celles déjà présentes
+            self.check_row_hash_column(table_name)
+            rows_inserted = self.insert_csv_file(csv_file_to_process, table_name)
             
-            if not new_rows:
+            self.connection.commit()
+            if rows_inserted == 0:
                 self.logger.info("Aucune nouvelle ligne détectée")
                 return 0
             
-            # Insérer les nouvelles lignes
-            rows_inserted = 0
-            for row, row_hash in new_rows:
-                values = list(row.values) + [row_hash]
-                placeholders = ', '.join(['%s'] * len(values))
-                columns = list(df.columns) + ['row_hash']
-                columns_str = ', '.join([f"`{col}`" for col in columns])
-                
-                insert_query = f"""
-                INSERT IGNORE INTO `{table_name}` ({columns_str})
-                VALUES ({placeholders})
-                """
-                
-                try:
-                    self.cursor.execute(insert_query, values)
-                    if self.cursor.rowcount > 0:
-                        rows_inserted += 1
-                except mysql.connector.Error as err:
-                    self.logger.warning(f"Erreur lors de l'insertion d'une nouvelle ligne: {err}")
-            
-            self.connection.commit()
             self.logger.info(f"Append terminé: {rows_inserted} nouvelles lignes ajoutées depuis '{csv_file_to_process}'")
             return rows_inserted
             
         except Exception as e:
+            if self.connection is not None:
+                self.connection.rollback()
             self.logger.error(f"Erreur lors de l'append: {e}")
             raise
     
-    def get_table_stats(self, table_name=None):
+    def get_table_stats(self, table_name=None, exact=True):
         """
         Retourne les statistiques de la table
+        (exact=False: estimations de information_schema.TABLES, sans parcourir la table; le nombre de
+        lignes est celui de l'optimiseur et MySQL 8 peut les garder en cache jusqu'à
+        information_schema_stats_expiry secondes)
         """
         try:
             if table_name is None:
-                table_name = self.config.get('csv', {}).get('default_table_name', 'csv_data')
-            
-            # Nombre total de lignes
-            self.cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
-            total_rows = self.cursor.fetchone()[0]
+                table_name = self.default_table_name
             
-            # Date de la dernière insertion
-            self.cursor.execute(f"SELECT MAX(created_at) FROM `{table_name}`")
-            last_insert = self.cursor.fetchone()[0]
+            if exact:
+                # Nombre total de lignes et date de la dernière insertion en une requête
+                self.cursor.execute(f"SELECT COUNT(*), MAX(created_at) FROM {quote_table_name(table_name)}")
+            else:
+                self.cursor.execute(
+                    "SELECT TABLE_ROWS, UPDATE_TIME FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                    (table_name,)
+                )
+            total_rows, last_insert = self.cursor.fetchone()
             
             return {
                 'table_name': table_name,
@@ -405,26 +1302,284 @@ class CSVtoMySQL:
             self.logger.error(f"Erreur lors de la récupération des stats: {e}")
             return None
     
+    def load_sync_state(self):
+        """
+        Charge l'état de synchronisation persistant (position de lecture de chaque fichier, par table)
+        """
+        state_file = self.config.get('monitoring', {}).get('state_file', 'csv_mysql_state.json')
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            self.logger.warning(f"Fichier d'état '{state_file}' illisible, relecture complète des fichiers: {e}")
+            return {}
+    
+    def save_sync_state(self, state):
+        """
+        Enregistre l'état de synchronisation (écriture atomique)
+        """
+        state_file = self.config.get('monitoring', {}).get('state_file', 'csv_mysql_state.json')
+        tmp_file = f"{state_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_file, state_file)
+    
+    def file_signature(self, csv_file, offset):
+        """
+        Empreinte des octets précédant offset, pour détecter un fichier réécrit plutôt que complété
+        """
+        with open(csv_file, 'rb') as f:
+            start = max(0, offset - SIGNATURE_BYTES)
+            f.seek(start)
+            # Empreinte de détection de réécriture, pas de sécurité: autorisée aussi en mode FIPS
+            return hashlib.md5(f.read(offset - start), usedforsecurity=False).hexdigest()
+    
+    def file_unchanged(self, entry, file_stat):
+        """
+        Indique si le fichier a gardé l'inode, la taille et la date de modification de son état de
+        reprise, auquel cas il n'y a rien à relire
+        """
+        return (entry is not None and entry['inode'] == file_stat.st_ino
+                and entry.get('size') == file_stat.st_size and entry.get('mtime') == file_stat.st_mtime)
+    
+    def complete_lines_end(self, csv_file, size):
+        """
+        Position juste après la dernière ligne complète parmi les size premiers octets du fichier
+        """
+        with open(csv_file, 'rb') as f:
+            end = size
+            while end > 0:
+                start = max(0, end - 65536)
+                f.seek(start)
+                block = f.read(end - start)
+                newline = block.rfind(b'\n')
+                if newline != -1:
+                    return start + newline + 1
+                end = start
+        return 0
+    
+    def iter_csv_tail(self, csv_file, offset, end, columns, dtypes=None):
+        """
+        Lit par blocs de csv.chunk_size lignes celles du CSV comprises entre les positions offset et end
+        (sans en-tête), avec les types imposés s'il y en a
+        """
+        # La projection limitée à end masque la ligne éventuellement en cours d'écriture, et pandas
+        # lit directement les pages du fichier sans copier toute la fin en mémoire
+        with open(csv_file, 'rb') as f, mmap.mmap(f.fileno(), end, access=mmap.ACCESS_READ) as mapped:
+            mapped.seek(offset)
+            yield from pd.read_csv(
+                mapped,
+                header=None,
+                names=columns,
+                dtype=csv_read_dtypes(dtypes),
+                encoding=self.csv_encoding,
+                sep=self.csv_separator,
+                low_memory=False,
+                chunksize=self.config.get('csv', {}).get('chunk_size', CHUNK_SIZE)
+            )
+    
+    def csv_tail_dtypes(self, csv_file, offset, end, entry):
+        """
+        Types du fichier complété: ceux de l'état de reprise, étendus aux valeurs des lignes comprises
+        entre offset et end
+        """
+        # Le signe des colonnes entières déjà lues n'est pas gardé: supposé négatif, des entiers
+        # au-delà de BIGINT les font passer en texte plutôt qu'en uint64
+        dtypes = entry['dtypes']
+        summary = (dtypes, {col for col, name in dtypes.items() if name == 'int64'})
+        for df in self.iter_csv_tail(csv_file, offset, end, entry['columns']):
+            summary = merge_csv_dtypes(summary, csv_dtype_summary(df))
+        return summary[0]
+    
+    def sync_csv_file(self, csv_file, table_name, state, save_state=True):
+        """
+        Synchronise un fichier en ne lisant que les lignes ajoutées depuis le dernier passage,
+        ou tout le fichier s'il est nouveau, tronqué ou réécrit (save_state=False laisse à
+        l'appelant l'enregistrement de l'état mis à jour)
+        """
+        key = sync_state_key(table_name, csv_file)
+        file_stat = os.stat(csv_file)
+        entry = state.get(key)
+        # Table supprimée ou vidée depuis: les lignes déjà lues n'y sont plus, tout le fichier est relu
+        if entry is not None and (not self.table_exists(table_name) or self.table_is_empty(table_name)):
+            entry = None
+        if self.file_unchanged(entry, file_stat):
+            return 0
+        end = self.complete_lines_end(csv_file, file_stat.st_size)
+        
+        # Les états enregistrés sans les types du fichier ne permettent pas de lire la fin seule
+        if (entry is not None and entry['inode'] == file_stat.st_ino and entry['offset'] <= end
+                and 'dtypes' in entry and self.file_signature(csv_file, entry['offset']) == entry['signature']):
+            # Fichier seulement complété: ne lire que la fin
+            if end == entry['offset']:
+                return 0
+            rows_inserted = 0
+            try:
+                self.check_row_hash_column(table_name)
+                # La fin est lue avec les types de tout le fichier, comme le ferait une relecture complète
+                dtypes = self.csv_tail_dtypes(csv_file, entry['offset'], end, entry)
+                if dtypes != entry['dtypes']:
+                    self.logger.warning(
+                        f"Les lignes ajoutées à '{csv_file}' changent le type de certaines colonnes: les lignes déjà "
+                        f"synchronisées auraient d'autres hashes si le fichier était relu en entier"
+                    )
+                    if self.config.get('monitoring', {}).get('auto_create_table', True):
+                        widened = self.widen_columns(table_name, entry['dtypes'], dtypes)
+                        if widened:
+                            self.logger.info(f"Colonnes élargies dans '{table_name}': {', '.join(map(str, widened))}")
+                for df in self.iter_csv_tail(csv_file, entry['offset'], end, entry['columns'], dtypes):
+                    rows_inserted += self.insert_dataframe(df, self.compute_row_hashes(df), table_name)
+            except Exception:
+                self.connection.rollback()
+                raise
+            self.connection.commit()
+            self.logger.info(f"Append incrémental terminé: {rows_inserted} nouvelles lignes ajoutées depuis '{csv_file}'")
+            columns = entry['columns']
+        else:
+            rows_inserted = self.append_new_rows(csv_file, table_name)
+            columns = self.csv_columns(csv_file)
+            dtypes = self.csv_dtypes(csv_file)
+        
+        state[key] = {
+            'inode': file_stat.st_ino,
+            'size': file_stat.st_size,
+            'mtime': file_stat.st_mtime,
+            'offset': end,
+            'signature': self.file_signature(csv_file, end),
+            'columns': columns,
+            'dtypes': dtypes
+        }
+        if save_state:
+            self.save_sync_state(state)
+        return rows_inserted
+    
+    def sync_csv_files_parallel(self, csv_files, table_name, state, workers):
+        """
+        Synchronise plusieurs fichiers en parallèle, chacun dans un processus avec sa propre connexion,
+        et retourne le nombre de lignes insérées par fichier synchronisé sans erreur
+        """
+        table_loaded = self.table_exists(table_name) and not self.table_is_empty(table_name)
+        # Fichiers inchangés depuis leur état de reprise: synchronisés sans lancer de processus
+        # (sauf si la table a été supprimée ou vidée depuis)
+        synced = {
+            csv_file: 0 for csv_file in csv_files
+            if table_loaded and self.file_unchanged(state.get(sync_state_key(table_name, csv_file)), os.stat(csv_file))
+        }
+        csv_files = [csv_file for csv_file in csv_files if csv_file not in synced]
+        if not csv_files:
+            return synced
+        
+        # Table absente ou vide: un seul import la crée ou la charge (import_csv_initial, qui retire puis
+        # reconstruit l'index UNIQUE) avant de répartir les autres fichiers, pour qu'aucun processus ne
+        # charge pendant qu'un autre a retiré l'index qui les dédoublonne
+        if not table_loaded:
+            synced[csv_files[0]] = self.sync_csv_file(csv_files[0], table_name, state, save_state=False)
+            csv_files = csv_files[1:]
+        
+        # spawn: les processus ne doivent pas hériter de la connexion MySQL de ce processus
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {
+                executor.submit(sync_csv_worker, self.config_file, csv_file, table_name,
+                                state.get(sync_state_key(table_name, csv_file))): csv_file
+                for csv_file in csv_files
+            }
+            for future in as_completed(futures):
+                csv_file = futures[future]
+                try:
+                    rows_inserted, entry = future.result()
+                except Exception as e:
+                    # Fichier non marqué comme synchronisé: il sera repris au prochain passage
+                    self.logger.error(f"Erreur lors de la synchronisation de {csv_file}: {e}")
+                    continue
+                if entry is not None:
+                    state[sync_state_key(table_name, csv_file)] = entry
+                synced[csv_file] = rows_inserted
+        
+        self.save_sync_state(state)
+        return synced
+    
+    def watch_directory(self, directory, pattern, changed):
+        """
+        Signale par l'événement changed toute création ou modification d'un fichier du dossier
+        correspondant au pattern (watchdog), et retourne l'observateur démarré ou None sans watchdog
+        """
+        if Observer is None:
+            return None
+        handler = PatternMatchingEventHandler(patterns=[pattern], ignore_directories=True)
+        handler.on_any_event = lambda event: changed.set()
+        observer = Observer()
+        observer.schedule(handler, directory, recursive=False)
+        observer.daemon = True
+        observer.start()
+        return observer
+    
+    def wait_for_change(self, changed, check_interval):
+        """
+        Attend un événement de modification ou la fin de l'intervalle, puis laisse passer la rafale
+        d'écritures en cours (jusqu'à EVENT_DEBOUNCE secondes sans événement, au plus check_interval)
+        """
+        if not changed.wait(check_interval):
+            return
+        deadline = time.monotonic() + check_interval
+        changed.clear()
+        while time.monotonic() < deadline and changed.wait(EVENT_DEBOUNCE):
+            changed.clear()
+    
     def monitor_csv_and_sync(self, csv_file=None, table_name=None):
         """
         Surveille le fichier CSV et synchronise automatiquement
         """
-        import time
-        
         if table_name is None:
-            table_name = self.config.get('csv', {}).get('default_table_name', 'csv_data')
+            table_name = self.default_table_name
         
         check_interval = self.config.get('monitoring', {}).get('check_interval', 60)
+        # Avec plusieurs processus, tous les fichiers nouveaux ou modifiés du dossier sont synchronisés
+        workers = self.config.get('monitoring', {}).get('workers', 1)
         csv_config = self.config.get('csv', {})
         scan_directory = csv_config.get('scan_directory', './csv_files')
+        file_pattern = csv_config.get('file_pattern', '*.csv')
         
         last_processed_file = None
         last_modified = 0
+        processed_mtimes = {}
+        sync_state = self.load_sync_state()
+        
+        # Avec watchdog, un changement réveille la boucle sans attendre la fin de l'intervalle,
+        # qui reste le délai maximal entre deux vérifications
+        if not os.path.exists(scan_directory):
+            os.makedirs(scan_directory)
+        changed = threading.Event()
+        if csv_file is None:
+            observer = self.watch_directory(scan_directory, file_pattern, changed)
+        else:
+            observer = self.watch_directory(os.path.dirname(os.path.abspath(csv_file)), os.path.basename(csv_file), changed)
         
         self.logger.info(f"Surveillance du dossier {scan_directory} démarrée (intervalle: {check_interval}s)")
         
         try:
             while True:
+                changed.clear()
+                if csv_file is None and workers > 1:
+                    changed_files = [
+                        (path, mtime) for path, mtime in self.list_csv_files(scan_directory, file_pattern)
+                        if mtime > processed_mtimes.get(path, 0)
+                    ]
+                    if changed_files:
+                        self.logger.info(f"Changement détecté: {len(changed_files)} fichier(s)")
+                        synced = self.sync_csv_files_parallel([path for path, _ in changed_files], table_name, sync_state, workers)
+                        for path, mtime in changed_files:
+                            if path in synced:
+                                processed_mtimes[path] = mtime
+                        
+                        if sum(synced.values()) > 0:
+                            stats = self.get_table_stats(table_name)
+                            self.logger.info(f"Synchronisation terminée. Total: {stats['total_rows']} lignes")
+                    
+                    self.wait_for_change(changed, check_interval)
+                    continue
+                
                 # Trouver le fichier CSV le plus récent
                 if csv_file is None:
                     current_file = self.find_latest_csv()
@@ -437,7 +1592,7 @@ class CSVtoMySQL:
                     # Vérifier si c'est un nouveau fichier ou si le fichier a été modifié
                     if (current_file != last_processed_file or current_modified > last_modified):
                         self.logger.info(f"Changement détecté: {current_file}")
-                        new_rows = self.append_new_rows(current_file, table_name)
+                        new_rows = self.sync_csv_file(current_file, table_name, sync_state)
                         
                         if new_rows > 0:
                             stats = self.get_table_stats(table_name)
@@ -448,12 +1603,16 @@ class CSVtoMySQL:
                 else:
                     self.logger.debug("Aucun fichier CSV trouvé")
                 
-                time.sleep(check_interval)
+                self.wait_for_change(changed, check_interval)
                 
         except KeyboardInterrupt:
             self.logger.info("Surveillance interrompue par l'utilisateur")
         except Exception as e:
             self.logger.error(f"Erreur lors de la surveillance: {e}")
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
 
 
 # Exemple d'utilisation
@@ -0,0 +1,259 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from mysql.connector.connection import MySQLConnection
+from mysql.connector.cursor import MySQLCursorPrepared
+
+import CSVtoMySQL as csv_to_mysql
+from CSVtoMySQL import CSVtoMySQL
+
+
+class MySQLChecksTest(unittest.TestCase):
+    """
+    Requêtes et contrôles côté MySQL, vérifiés sur un curseur simulé (sans serveur)
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+
+    def make_importer(self, **csv_config):
+        config_file = os.path.join(self.directory, 'config.json')
+        with open(config_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'database': {'host': 'localhost'},
+                'csv': dict({'hash_algorithm': 'md5'}, **csv_config),
+                'logging': {'file': os.devnull}
+            }, f)
+        importer = CSVtoMySQL(config_file)
+        importer.connection = mock.Mock()
+        importer.cursor = mock.Mock()
+        return importer
+
+    def executed_sql(self, cursor):
+        return [call.args[0] for call in cursor.execute.call_args_list]
+
+    def write_sample(self):
+        # Des entiers dans les premières lignes, puis un décimal et du texte
+        csv_file = os.path.join(self.directory, 'data.csv')
+        with open(csv_file, 'w', encoding='utf-8') as f:
+            f.write('id,amount\n1,10\n2,20\n3,12.75\n4,abc\n')
+        return csv_file
+
+    def test_chunked_create_table_uses_whole_file_types(self):
+        # Premier bloc sans le décimal ni le texte: colonne en VARCHAR comme en une seule lecture
+        csv_file = self.write_sample()
+        importer = self.make_importer(large_file_mb=0, chunk_size=2)
+        first_chunk = next(importer.iter_csv_chunks(csv_file))
+        importer.create_table_from_dataframe(first_chunk, 'csv_data')
+        create_query = self.executed_sql(importer.cursor)[0]
+        self.assertIn('`id` BIGINT', create_query)
+        self.assertIn('`amount` VARCHAR(255)', create_query)
+
+    def check_warnings(self, warnings, warning_count, rows_sent, rows_inserted, strict_values=True):
+        importer = self.make_importer()
+        importer.strict_values = strict_values
+        importer.logger = mock.Mock()
+        importer.cursor.fetchall.return_value = warnings
+        importer.check_insert_warnings(warning_count, rows_sent, rows_inserted)
+        return importer
+
+    def test_duplicate_warnings_are_accepted(self):
+        importer = self.check_warnings([
+            ('Warning', 1062, "Duplicate entry 'a' for key 'row_hash'"),
+            ('Note', 1265, "Data truncated for column 'amount' at row 1")
+        ], 2, 3, 2)
+        importer.logger.warning.assert_not_called()
+
+    def test_duplicate_only_warnings_are_not_fetched(self):
+        importer = self.check_warnings([], 3, 5, 2)
+        importer.cursor.execute.assert_not_called()
+
+    def test_conversion_warnings_raise(self):
+        with self.assertRaises(ValueError):
+            self.check_warnings([
+                ('Warning', 1062, "Duplicate entry 'a' for key 'row_hash'"),
+                ('Warning', 1366, "Incorrect integer value: 'abc' for column 'amount' at row 2")
+            ], 2, 3, 2)
+
+    def test_conversion_warnings_logged_without_strict_values(self):
+        importer = self.check_warnings([
+            ('Warning', 1265, "Data truncated for column 'label' at row 1")
+        ], 1, 3, 3, strict_values=False)
+        importer.logger.warning.assert_called_once()
+
+    def test_truncated_warning_list_beyond_duplicates_raises(self):
+        with self.assertRaises(ValueError):
+            self.check_warnings([('Warning', 1062, "Duplicate entry 'a' for key 'row_hash'")] * 2, 5, 10, 8)
+
+    def check_row_hash(self, hash_algorithm, column):
+        importer = self.make_importer(hash_algorithm=hash_algorithm)
+        importer.cursor.fetchone.return_value = column
+        importer.check_row_hash_column('csv_data')
+
+    def test_row_hash_algorithm_recorded_in_comment(self):
+        self.check_row_hash('xxh3_64', ('bigint', None, 'xxh3_64'))
+        with self.assertRaises(ValueError):
+            self.check_row_hash('pandas64', ('bigint', None, 'xxh3_64'))
+
+    def test_row_hash_type_mismatch_raises(self):
+        self.check_row_hash('md5', ('varchar', 64, ''))
+        with self.assertRaises(ValueError):
+            self.check_row_hash('xxh3_64', ('varchar', 64, ''))
+        with self.assertRaises(ValueError):
+            self.check_row_hash('md5', ('bigint', None, ''))
+
+    def test_ambiguous_bigint_row_hash_raises_without_comment(self):
+        for hash_algorithm in ('xxh3_64', 'pandas64'):
+            with self.assertRaises(ValueError):
+                self.check_row_hash(hash_algorithm, ('bigint', None, ''))
+
+    def test_created_table_records_hash_algorithm(self):
+        importer = self.make_importer(hash_algorithm='xxh3_64')
+        importer.create_table_from_dataframe(importer.read_csv(self.write_sample()), 'csv_data', unique_hash=False)
+        self.assertIn("`row_hash` BIGINT UNSIGNED COMMENT 'xxh3_64'", self.executed_sql(importer.cursor)[0])
+
+    def test_prepared_statement_prepared_once_for_full_batches(self):
+        importer = self.make_importer()
+        importer.prepared_statements = True
+        importer.batch_size = 2
+        importer.max_allowed_packet = 1 << 20
+        # Vrai curseur préparé du connecteur, sur une connexion simulée qui compte les préparations
+        connection = mock.Mock(spec=MySQLConnection, charset='utf8mb4', get_warnings=False)
+        connection.cmd_stmt_prepare.side_effect = lambda operation, **kwargs: {
+            'statement_id': connection.cmd_stmt_prepare.call_count,
+            'parameters': [None] * operation.count(b'?'),
+            'columns': []
+        }
+        connection.cmd_stmt_execute.return_value = {
+            'affected_rows': 2, 'insert_id': 0, 'warning_count': 1, 'server_status': 0
+        }
+        connection.cursor.side_effect = lambda prepared=False: MySQLCursorPrepared(connection)
+        importer.connection = connection
+        importer.cursor.fetchall.return_value = [('Warning', 1062, "Duplicate entry 'a' for key 'row_hash'")]
+        df = importer.read_csv(self.write_sample())
+        insert_query = 'INSERT IGNORE INTO `csv_data` (`id`, `amount`, `row_hash`) VALUES (%s, %s, %s)'
+        for _ in range(3):
+            importer.insert_rows(df.head(3), ['a', 'b', 'c'], insert_query)
+        # Lots complets: une préparation pour les trois blocs, malgré les avertissements de doublons;
+        # dernier lot d'une ligne: une par bloc, fermée après usage
+        self.assertEqual(connection.cmd_stmt_prepare.call_count, 4)
+        self.assertEqual(connection.cmd_stmt_close.call_count, 3)
+        self.assertEqual(list(importer.prepared_cursors), [insert_query])
+
+    def test_parallel_sync_loads_empty_table_from_one_file_first(self):
+        importer = self.make_importer()
+        csv_files = []
+        for name in ('a.csv', 'b.csv', 'c.csv'):
+            csv_files.append(os.path.join(self.directory, name))
+            with open(csv_files[-1], 'w', encoding='utf-8') as f:
+                f.write('id\n1\n')
+        submitted = []
+
+        def submit(function, config_file, csv_file, table_name, entry):
+            submitted.append(csv_file)
+            future = mock.Mock()
+            future.result.return_value = (1, None)
+            return future
+
+        executor = mock.MagicMock()
+        executor.__enter__.return_value.submit.side_effect = submit
+        with mock.patch.object(importer, 'table_exists', return_value=True), \
+                mock.patch.object(importer, 'table_is_empty', return_value=True), \
+                mock.patch.object(importer, 'sync_csv_file', return_value=1) as sync_csv_file, \
+                mock.patch.object(importer, 'save_sync_state'), \
+                mock.patch.object(csv_to_mysql, 'ProcessPoolExecutor', return_value=executor), \
+                mock.patch.object(csv_to_mysql, 'as_completed', side_effect=list):
+            importer.sync_csv_files_parallel(csv_files, 'csv_data', {}, 2)
+        # Table vide: le premier fichier est chargé par ce processus avant de lancer les autres
+        sync_csv_file.assert_called_once_with(csv_files[0], 'csv_data', {}, save_state=False)
+        self.assertEqual(submitted, csv_files[1:])
+
+    def test_sync_reads_tail_only_into_the_table_already_loaded(self):
+        importer = self.make_importer()
+        csv_file = os.path.join(self.directory, 'data.csv')
+        with open(csv_file, 'w', encoding='utf-8') as f:
+            f.write('id,qty\n1,10\n2,20\n')
+        state = {}
+        tables = {'csv_data': False, 'other': False}
+
+        def sync(table_name):
+            with mock.patch.object(importer, 'table_exists', side_effect=lambda name: name in tables), \
+                    mock.patch.object(importer, 'table_is_empty', side_effect=lambda name: tables[name]), \
+                    mock.patch.object(importer, 'check_row_hash_column'), \
+                    mock.patch.object(importer, 'append_new_rows', return_value=0) as append_new_rows, \
+                    mock.patch.object(importer, 'insert_dataframe', return_value=0) as insert_dataframe:
+                importer.sync_csv_file(csv_file, table_name, state, save_state=False)
+            return append_new_rows.called, insert_dataframe.called
+
+        def append(line):
+            with open(csv_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+        self.assertEqual(sync('csv_data'), (True, False))
+        append('3,30\n')
+        self.assertEqual(sync('csv_data'), (False, True))
+        # Autre table: pas de position de reprise, tout le fichier est relu
+        self.assertEqual(sync('other'), (True, False))
+        # Table vidée puis supprimée: tout le fichier est relu, pas seulement les lignes ajoutées
+        tables['csv_data'] = True
+        append('4,40\n')
+        self.assertEqual(sync('csv_data'), (True, False))
+        del tables['csv_data']
+        append('5,50\n')
+        self.assertEqual(sync('csv_data'), (True, False))
+
+    def test_local_infile_limited_to_temporary_directory(self):
+        importer = self.make_importer()
+        importer.config['database'].update({'user': 'csv', 'password': '', 'database': 'csv'})
+        with mock.patch.object(csv_to_mysql.mysql.connector, 'connect') as connect:
+            self.assertTrue(importer.connect())
+        config = connect.call_args.kwargs
+        self.assertFalse(config['allow_local_infile'])
+        self.assertEqual(config['allow_local_infile_in_path'], tempfile.gettempdir())
+
+    def test_pooled_insert_closes_its_connections(self):
+        importer = self.make_importer()
+        importer.pool_size = 2
+        importer.connection_config = {'host': 'db.example'}
+        connections = []
+
+        def connect(**config):
+            connections.append(mock.Mock())
+            return connections[-1]
+
+        chunks = [(pd.DataFrame({'id': range(5)}), list('abcde'), {})] * 2
+        with mock.patch.object(csv_to_mysql.mysql.connector, 'connect', side_effect=connect), \
+                mock.patch.object(CSVtoMySQL, 'insert_chunk_committed', lambda worker, df, *args: len(df)):
+            self.assertEqual(importer.insert_chunks_pooled(iter(chunks), 'csv_data'), 10)
+        self.assertTrue(1 <= len(connections) <= 2)
+        for connection in connections:
+            connection.close.assert_called_once_with()
+
+    def test_failed_load_rolls_back_before_rebuilding_index(self):
+        importer = self.make_importer()
+        calls = []
+        importer.connection.rollback.side_effect = lambda: calls.append('rollback')
+
+        def add_row_hash_index(table_name):
+            calls.append('index')
+            raise RuntimeError('index')
+
+        with mock.patch.object(importer, 'insert_dataframe', side_effect=ValueError('insert')), \
+                mock.patch.object(importer, 'add_row_hash_index', side_effect=add_row_hash_index):
+            # L'erreur d'origine remonte, pas celle de la reconstruction de l'index
+            with self.assertRaisesRegex(ValueError, 'insert'):
+                importer.insert_csv_file(self.write_sample(), 'csv_data', create_table=True, defer_unique_index=True)
+        self.assertEqual(calls, ['rollback', 'index'])
+
+
+if __name__ == '__main__':
+    unittest.main()
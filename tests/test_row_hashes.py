@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CSVtoMySQL as csv_to_mysql
+from CSVtoMySQL import CSVtoMySQL
+
+
+def sample_csv_text(rows=60, seed=0):
+    """
+    CSV dont les valeurs dépendent du moteur d'analyse ou des types déduits: flottants écrits par
+    repr(), entier hors de BIGINT, signe explicite, booléen mêlé à un entier, trou tardif dans une colonne entière
+    """
+    rng = random.Random(seed)
+    lines = ['id,amount,big,signed,flag,label,qty']
+    for i in range(1, rows + 1):
+        lines.append(','.join([
+            str(i),
+            repr(rng.random() * 1000),
+            '99999999999999999999' if i == rows // 2 else str(rng.randrange(10 ** 6)),
+            '+5' if i % 7 == 0 else str(rng.randrange(-50, 50)),
+            'TRUE' if i % 2 else '1',
+            f'"texte {i}, avec virgule"',
+            '' if i == rows - 1 else str(rng.randrange(100))
+        ]))
+    return '\n'.join(lines) + '\n'
+
+
+class RowHashConsistencyTest(unittest.TestCase):
+    """
+    Une ligne doit garder le même row_hash quel que soit le chemin de lecture du fichier,
+    sans quoi elle est réinsérée en double au prochain append
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+
+    def make_importer(self, **csv_config):
+        config_file = os.path.join(self.directory, 'config.json')
+        with open(config_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'database': {'host': 'localhost'},
+                'csv': dict({'hash_algorithm': 'md5'}, **csv_config),
+                'logging': {'file': os.devnull}
+            }, f)
+        return CSVtoMySQL(config_file)
+
+    def write_csv(self, text, name='data.csv'):
+        csv_file = os.path.join(self.directory, name)
+        with open(csv_file, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        return csv_file
+
+    def baseline_hashes(self, csv_file):
+        """
+        Hashes tels que les calculait la version d'origine (iterrows sur une lecture complète)
+        """
+        df = pd.read_csv(csv_file)
+        return [
+            hashlib.md5('|'.join(str(value) for value in row.values).encode()).hexdigest()
+            for _, row in df.iterrows()
+        ]
+
+    def whole_file_hashes(self, csv_file):
+        importer = self.make_importer()
+        return importer.compute_row_hashes(importer.read_csv(csv_file))
+
+    def chunked_hashes(self, importer, csv_file):
+        return [h for _, hashes in importer.iter_csv_hashed_chunks(csv_file) for h in hashes]
+
+    def test_read_csv_matches_baseline(self):
+        csv_file = self.write_csv(sample_csv_text())
+        importer = self.make_importer()
+        self.assertEqual(importer.compute_row_hashes(importer.read_csv(csv_file)), self.baseline_hashes(csv_file))
+
+    def test_whole_file_chunks_match_read_csv(self):
+        csv_file = self.write_csv(sample_csv_text())
+        importer = self.make_importer()
+        hashes = [h for df in importer.iter_csv_chunks(csv_file) for h in importer.compute_row_hashes(df)]
+        self.assertEqual(hashes, importer.compute_row_hashes(importer.read_csv(csv_file)))
+
+    def test_chunks_match_whole_file_read(self):
+        # Le trou de qty n'apparaît que dans le deuxième bloc: le premier doit quand même la lire en float64
+        for text in ['id,qty\n1,10\n2,20\n3,30\n4,\n5,50\n', sample_csv_text()]:
+            csv_file = self.write_csv(text)
+            importer = self.make_importer(large_file_mb=0, chunk_size=3)
+            self.assertEqual(self.chunked_hashes(importer, csv_file), self.whole_file_hashes(csv_file))
+
+    def test_chunk_dtypes_follow_whole_file_inference(self):
+        columns = {
+            'unsigned': ['1', '2', '3', '9223372036854775808', '5', '6'],
+            'mixed_sign': ['-1', '2', '3', '9223372036854775808', '5', '6'],
+            'flag': ['True', 'False', 'True', '', 'False', 'True'],
+            'number': ['1', '2', '3', '4.5', '5', '6'],
+            'text': ['1', '2', '3', 'abc', '5', '6'],
+            'empty': ['', '', '', '', '', '1']
+        }
+        text = ','.join(columns) + '\n' + ''.join(
+            ','.join(values) + '\n' for values in zip(*columns.values())
+        )
+        csv_file = self.write_csv(text)
+        importer = self.make_importer(large_file_mb=0, chunk_size=2)
+        # Même famille de type que la lecture complète, donc même type de colonne MySQL
+        expected = {col: dtype.kind for col, dtype in importer.read_csv(csv_file).dtypes.items()}
+        importer.connection = mock.Mock()
+        importer.cursor = mock.Mock()
+        for df in importer.iter_csv_chunks(csv_file):
+            self.assertEqual({col: dtype.kind for col, dtype in df.dtypes.items()}, expected)
+            # Colonne créée d'après un bloc sans la grande valeur: elle doit quand même pouvoir la contenir
+            importer.create_table_from_dataframe(df, 'csv_data')
+            create_query = importer.cursor.execute.call_args.args[0]
+            self.assertIn('`unsigned` BIGINT UNSIGNED', create_query)
+            self.assertIn('`mixed_sign` VARCHAR(255)', create_query)
+        self.assertEqual(self.chunked_hashes(importer, csv_file), self.whole_file_hashes(csv_file))
+
+    def test_byte_ranges_match_whole_file_read(self):
+        csv_file = self.write_csv(sample_csv_text(rows=200))
+        importer = self.make_importer(large_file_mb=0, parse_workers=2)
+        with mock.patch.object(csv_to_mysql, 'RANGE_BYTES', 256):
+            self.assertGreater(len(importer.csv_byte_ranges(csv_file)), 2)
+            self.assertEqual(self.chunked_hashes(importer, csv_file), self.whole_file_hashes(csv_file))
+
+    def tail_hashes(self, importer, csv_file, head_size, entry):
+        end = os.path.getsize(csv_file)
+        dtypes = importer.csv_tail_dtypes(csv_file, head_size, end, entry)
+        return [
+            h for df in importer.iter_csv_tail(csv_file, head_size, end, entry['columns'], dtypes)
+            for h in importer.compute_row_hashes(df)
+        ], dtypes
+
+    def test_tail_matches_whole_file_read(self):
+        # Le trou de qty est dans les lignes déjà synchronisées: la fin seule n'en contient pas
+        head = 'id,qty\n1,10\n2,\n3,30\n'
+        csv_file = self.write_csv(head)
+        importer = self.make_importer()
+        entry = {'columns': importer.csv_columns(csv_file), 'dtypes': importer.csv_dtypes(csv_file)}
+        with open(csv_file, 'a', encoding='utf-8', newline='') as f:
+            f.write('4,40\n5,50\n')
+        hashes, dtypes = self.tail_hashes(importer, csv_file, len(head), entry)
+        self.assertEqual(dtypes, entry['dtypes'])
+        self.assertEqual(hashes, self.whole_file_hashes(csv_file)[3:])
+
+    def test_tail_widening_dtypes_matches_whole_file_read(self):
+        head = 'id,qty\n1,10\n2,20\n'
+        csv_file = self.write_csv(head)
+        importer = self.make_importer()
+        entry = {'columns': importer.csv_columns(csv_file), 'dtypes': importer.csv_dtypes(csv_file)}
+        with open(csv_file, 'a', encoding='utf-8', newline='') as f:
+            f.write('3,30\n4,4.5\n')
+        hashes, dtypes = self.tail_hashes(importer, csv_file, len(head), entry)
+        self.assertEqual(dtypes, {'id': 'int64', 'qty': 'float64'})
+        self.assertEqual(hashes, self.whole_file_hashes(csv_file)[2:])
+
+
+if __name__ == '__main__':
+    unittest.main()